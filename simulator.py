@@ -5,17 +5,34 @@ Loads preset workflow definitions and executes them, emitting IVCAP events
 with randomized timing to simulate multi-agent workflows.
 """
 
+import asyncio
+import contextvars
+import functools
 import json
+import logging
 import random
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from dataclasses import dataclass
+from typing import NamedTuple
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter
 from ivcap_service import JobContext, getLogger
 
 
-class AgentConfig(BaseModel):
+class _DelayRangeMixin:
+    """Shared sampling helper for configs with a delay_range_ms field."""
+
+    @functools.cached_property
+    def _delay_bounds(self) -> tuple[int, int]:
+        """delay_range_ms as (min_ms, span) for integer sampling."""
+        min_ms, max_ms = self.delay_range_ms
+        return min_ms, max_ms - min_ms + 1
+
+
+class AgentConfig(_DelayRangeMixin, BaseModel):
     """Configuration for a single agent within a phase."""
     id: str = Field(description="Unique identifier for the agent")
     name: str = Field(description="Display name of the agent")
@@ -26,8 +43,18 @@ class AgentConfig(BaseModel):
         description="Min/max delay in ms between task updates"
     )
 
+    model_config = ConfigDict(frozen=True, extra="forbid")
+
+
+class _AgentPlan(NamedTuple):
+    """Event step ids and messages for one agent, derived from its phase and config."""
+    step_id: str
+    task_step_ids: tuple[str, ...]
+    start_msg: str
+    end_msg: str
+
 
-class PhaseConfig(BaseModel):
+class PhaseConfig(_DelayRangeMixin, BaseModel):
     """Configuration for a workflow phase."""
     id: str = Field(description="Unique identifier for the phase")
     name: str = Field(description="Display name of the phase")
@@ -40,6 +67,39 @@ class PhaseConfig(BaseModel):
         description="Agents that execute within this phase"
     )
 
+    model_config = ConfigDict(frozen=True, extra="forbid")
+
+    @functools.cached_property
+    def _step_id(self) -> str:
+        """Event step id for this phase."""
+        return f"phase:{self.id}"
+
+    @functools.cached_property
+    def _start_msg(self) -> str:
+        """Message for this phase's start event."""
+        return f"{self.name} started"
+
+    @functools.cached_property
+    def _end_msg(self) -> str:
+        """Message for this phase's completion event."""
+        return f"{self.name} completed"
+
+    @functools.cached_property
+    def _agent_plans(self) -> tuple[_AgentPlan, ...]:
+        """Event step ids and messages for each agent, in agent order."""
+        plans = []
+        for agent in self.agents:
+            step_id = f"agent:{self.id}:{agent.id}"
+            plans.append(_AgentPlan(
+                step_id=step_id,
+                task_step_ids=tuple(
+                    f"{step_id}:task-{i+1}" for i in range(len(agent.tasks))
+                ),
+                start_msg=f"{agent.name} started",
+                end_msg=f"{agent.name} completed",
+            ))
+        return tuple(plans)
+
 
 class WorkflowPreset(BaseModel):
     """Complete workflow preset definition."""
@@ -49,8 +109,32 @@ class WorkflowPreset(BaseModel):
     phases: list[PhaseConfig] = Field(
         description="Ordered list of workflow phases")
 
+    model_config = ConfigDict(frozen=True, extra="forbid")
+
+
+# Built once so the compiled validator is reused across loads.
+_PRESET_ADAPTER = TypeAdapter(WorkflowPreset)
 
-@dataclass
+
+@functools.lru_cache(maxsize=32)
+def _load_preset_cached(path: str, mtime_ns: int) -> WorkflowPreset:
+    """
+    Parse and validate a preset file, memoized per (path, mtime).
+
+    The mtime is part of the cache key so that editing a preset on disk
+    invalidates the cached entry on the next load.
+    """
+    data = json.loads(Path(path).read_bytes())
+    return _PRESET_ADAPTER.validate_python(data)
+
+
+@functools.lru_cache(maxsize=1)
+def _list_presets_cached(dir_str: str, dir_mtime_ns: int) -> tuple[str, ...]:
+    """List preset names in a directory, memoized per (dir, mtime)."""
+    return tuple(p.stem for p in Path(dir_str).glob("*.json"))
+
+
+@dataclass(slots=True, frozen=True)
 class SimulationResult:
     """Result of running a workflow simulation."""
     preset_name: str
@@ -73,17 +157,29 @@ class WorkflowSimulator:
         self,
         job_context: JobContext,
         logger=None,
+        concurrent_agents: bool = False,
+        coalesce_delays: bool = False,
     ):
         """
         Initialize the simulator.
 
         Args:
             job_context: IVCAP JobContext for emitting events
+            concurrent_agents: Run the agents of a phase in parallel threads
+                rather than one after another
+            coalesce_delays: Sleep once per agent for the total of its
+                planned delays, then emit its events back-to-back (same
+                overall duration, one wakeup instead of one per task)
         """
         self.job_context = job_context
         self._event_count = 0
         self._agents_executed = 0
         self.logger = logger or getLogger("simulator")
+        self._rng = random.Random()
+        self.concurrent_agents = concurrent_agents
+        self.coalesce_delays = coalesce_delays
+        # Guards the counters when agents run concurrently
+        self._lock = threading.Lock()
 
     def load_preset(self, preset_name: str) -> WorkflowPreset:
         """
@@ -102,66 +198,134 @@ class WorkflowSimulator:
         preset_path = self.PRESETS_DIR / f"{preset_name}.json"
 
         if not preset_path.exists():
-            available = [p.stem for p in self.PRESETS_DIR.glob("*.json")]
+            available = list(self._preset_names())
             raise FileNotFoundError(
                 f"Preset '{preset_name}' not found. Available presets: {available}"
             )
 
-        with open(preset_path) as f:
-            data = json.load(f)
+        return _load_preset_cached(str(preset_path), preset_path.stat().st_mtime_ns)
 
-        return WorkflowPreset(**data)
+    @classmethod
+    def warm_presets(cls) -> dict[str, WorkflowPreset]:
+        """
+        Load every preset in PRESETS_DIR into the preset cache.
 
-    def list_presets(self) -> list[str]:
-        """Return list of available preset names."""
-        if not self.PRESETS_DIR.exists():
-            return []
-        return [p.stem for p in self.PRESETS_DIR.glob("*.json")]
+        Intended for service startup so the first run of each preset does not
+        pay for disk reads and parsing. Invalid presets are logged and skipped;
+        running one still raises as usual.
 
-    def _random_delay(self, delay_range_ms: list[int]) -> None:
-        """Sleep for a random duration within the given range."""
-        min_ms, max_ms = delay_range_ms
-        delay_ms = random.randint(min_ms, max_ms)
-        time.sleep(delay_ms / 1000.0)
+        Returns:
+            Mapping of preset name to loaded WorkflowPreset
+        """
+        presets: dict[str, WorkflowPreset] = {}
+        if not cls.PRESETS_DIR.exists():
+            return presets
+        for preset_path in cls.PRESETS_DIR.glob("*.json"):
+            try:
+                presets[preset_path.stem] = _load_preset_cached(
+                    str(preset_path), preset_path.stat().st_mtime_ns
+                )
+            except (OSError, ValueError) as e:
+                getLogger("simulator").warning(
+                    "Skipping invalid preset %s: %s", preset_path.name, e
+                )
+        return presets
 
-    def _execute_agent(self, phase_id: str, agent: AgentConfig) -> None:
+    def list_presets(self) -> list[str]:
+        """Return list of available preset names."""
+        return list(self._preset_names())
+
+    def _preset_names(self) -> tuple[str, ...]:
+        """Return the cached preset listing for PRESETS_DIR."""
+        try:
+            dir_mtime_ns = self.PRESETS_DIR.stat().st_mtime_ns
+        except FileNotFoundError:
+            return ()
+        return _list_presets_cached(str(self.PRESETS_DIR), dir_mtime_ns)
+
+    def _sample_delay_ms(self, delay_bounds: tuple[int, int]) -> int:
+        """Draw a random delay in ms within a config's delay bounds."""
+        min_ms, span = delay_bounds
+        return min_ms + self._rng.randrange(span)
+
+    def _random_delay(self, delay_bounds: tuple[int, int]) -> None:
+        """Sleep for a random duration within a config's delay bounds."""
+        time.sleep(self._sample_delay_ms(delay_bounds) / 1000.0)
+
+    def _count_events(self, n: int) -> None:
+        """Add to the emitted event count (thread-safe)."""
+        with self._lock:
+            self._event_count += n
+
+    def _execute_agent(self, agent: AgentConfig, plan: _AgentPlan) -> None:
         """Execute a single agent's tasks within a phase."""
-        agent_step_id = f"agent:{phase_id}:{agent.id}"
-
-        self.logger.info("Starting agent %s: %s", agent_step_id, agent.name)
-        with self.job_context.report.step(agent_step_id, message=f"{agent.name} started") as agent_step:
-            self._event_count += 1
+        agent_step_id = plan.step_id
+
+        log_info = self.logger.isEnabledFor(logging.INFO)
+        if log_info:
+            self.logger.info("Starting agent %s: %s", agent_step_id, agent.name)
+        with self.job_context.report.step(agent_step_id, message=plan.start_msg) as agent_step:
+            self._count_events(1)
+
+            # Plan one delay before each task plus one before completion
+            delays_ms = [
+                self._sample_delay_ms(agent._delay_bounds)
+                for _ in range(len(agent.tasks) + 1)
+            ]
+            if self.coalesce_delays:
+                time.sleep(sum(delays_ms) / 1000.0)
 
             # Execute each task
-            for i, task in enumerate(agent.tasks):
-                self._random_delay(agent.delay_range_ms)
-                status_step_id = f"{agent_step_id}:task-{i+1}"
-                self.logger.info("Task %s: %s", status_step_id, task)
+            for status_step_id, task, delay_ms in zip(
+                plan.task_step_ids, agent.tasks, delays_ms
+            ):
+                if not self.coalesce_delays:
+                    time.sleep(delay_ms / 1000.0)
+                if log_info:
+                    self.logger.info("Task %s: %s", status_step_id, task)
                 with self.job_context.report.step(status_step_id, message=task):
-                    self._event_count += 2  # start + finish
+                    self._count_events(2)  # start + finish
 
             # Agent completed
-            self._random_delay(agent.delay_range_ms)
-            agent_step.finished(f"{agent.name} completed")
-            self._event_count += 1
-        self._agents_executed += 1
+            if not self.coalesce_delays:
+                time.sleep(delays_ms[-1] / 1000.0)
+            agent_step.finished(plan.end_msg)
+            self._count_events(1)
+        with self._lock:
+            self._agents_executed += 1
 
     def _execute_phase(self, phase: PhaseConfig) -> None:
         """Execute a single workflow phase and all its agents."""
-        phase_step_id = f"phase:{phase.id}"
+        phase_step_id = phase._step_id
 
         self.logger.info("Starting phase %s: %s", phase_step_id, phase.name)
-        with self.job_context.report.step(phase_step_id, message=f"{phase.name} started") as phase_step:
+        with self.job_context.report.step(phase_step_id, message=phase._start_msg) as phase_step:
             self._event_count += 1
-            self._random_delay(phase.delay_range_ms)
+            self._random_delay(phase._delay_bounds)
 
             # Execute all agents in the phase
-            for agent in phase.agents:
-                self._execute_agent(phase.id, agent)
+            if self.concurrent_agents and len(phase.agents) > 1:
+                with ThreadPoolExecutor(
+                    max_workers=len(phase.agents), thread_name_prefix="agent"
+                ) as executor:
+                    # Each agent gets its own context copy so OTEL spans
+                    # opened by its steps nest under the phase span.
+                    futures = [
+                        executor.submit(
+                            contextvars.copy_context().run,
+                            self._execute_agent, agent, plan,
+                        )
+                        for agent, plan in zip(phase.agents, phase._agent_plans)
+                    ]
+                for future in futures:
+                    future.result()  # re-raise any agent failure
+            else:
+                for agent, plan in zip(phase.agents, phase._agent_plans):
+                    self._execute_agent(agent, plan)
 
             # Phase completed
-            self._random_delay(phase.delay_range_ms)
-            phase_step.finished(f"{phase.name} completed")
+            self._random_delay(phase._delay_bounds)
+            phase_step.finished(phase._end_msg)
             self._event_count += 1
 
     def run(self, preset_name: str) -> SimulationResult:
@@ -204,36 +368,83 @@ class WorkflowSimulator:
             elapsed_seconds=elapsed
         )
 
+    def _emit_tick(self, step_id: str, message: str) -> None:
+        """Emit the start/finish step pair for a single timer tick."""
+        with self.job_context.report.step(step_id, message=message):
+            self._event_count += 2  # start + finish
+
+    async def _emit_ticks(self, first: int, last: int) -> None:
+        """Emit one step covering ticks `first`..`last` (inclusive)."""
+        if first == last:
+            step_id, message = f"timer:tick:{last}", f"Tick {last}"
+        else:
+            step_id, message = f"timer:ticks:{first}-{last}", f"Ticks {first}..{last}"
+        # Event reporting is blocking I/O; keep it off the event loop.
+        await asyncio.to_thread(self._emit_tick, step_id, message)
+
     def run_timer_tick(
         self,
         total_run_time_seconds: float,
         tick_interval_seconds: float,
+        ticks_per_event: int = 1,
     ) -> SimulationResult:
         """
         Run a simple timer/tick simulation for a fixed duration.
 
-        Emits one event per tick interval using the step context manager.
+        Blocking wrapper around arun_timer_tick for synchronous callers.
         """
-        start_time = time.time()
+        return asyncio.run(self.arun_timer_tick(
+            total_run_time_seconds=total_run_time_seconds,
+            tick_interval_seconds=tick_interval_seconds,
+            ticks_per_event=ticks_per_event,
+        ))
+
+    async def arun_timer_tick(
+        self,
+        total_run_time_seconds: float,
+        tick_interval_seconds: float,
+        ticks_per_event: int = 1,
+    ) -> SimulationResult:
+        """
+        Run a simple timer/tick simulation for a fixed duration.
+
+        Emits one event per tick interval using the step context manager,
+        or one aggregate event per `ticks_per_event` ticks when that is > 1
+        (any trailing partial group is emitted when the run ends).
+        Ticks are scheduled against fixed deadlines in integer monotonic
+        nanoseconds so neither event emission time nor float rounding
+        accumulates as drift, and waiting yields to the event loop so
+        several simulations can share it.
+        """
+        if ticks_per_event < 1:
+            raise ValueError("ticks_per_event must be >= 1")
+
         self._event_count = 0
         self._agents_executed = 0
 
-        end_time = start_time + total_run_time_seconds
+        start_ns = time.monotonic_ns()
+        end_ns = start_ns + int(total_run_time_seconds * 1e9)
+        tick_ns = int(tick_interval_seconds * 1e9)
         tick_index = 0
+        pending_ticks = 0
+        log_info = self.logger.isEnabledFor(logging.INFO)
 
-        while time.time() < end_time:
+        while time.monotonic_ns() < end_ns:
             tick_index += 1
-            step_id = f"timer:tick:{tick_index}"
-            self.logger.info("Tick %d", tick_index)
-            with self.job_context.report.step(step_id, message=f"Tick {tick_index}"):
-                self._event_count += 2  # start + finish
+            pending_ticks += 1
+            if log_info:
+                self.logger.info("Tick %d", tick_index)
+            if pending_ticks == ticks_per_event:
+                await self._emit_ticks(tick_index - pending_ticks + 1, tick_index)
+                pending_ticks = 0
+
+            deadline_ns = min(start_ns + tick_index * tick_ns, end_ns)
+            await asyncio.sleep(max(0, deadline_ns - time.monotonic_ns()) / 1e9)
 
-            remaining = end_time - time.time()
-            if remaining <= 0:
-                break
-            time.sleep(min(tick_interval_seconds, remaining))
+        if pending_ticks:
+            await self._emit_ticks(tick_index - pending_ticks + 1, tick_index)
 
-        elapsed = time.time() - start_time
+        elapsed = (time.monotonic_ns() - start_ns) / 1e9
         return SimulationResult(
             preset_name="timer_tick",
             phases_completed=0,
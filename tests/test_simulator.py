@@ -0,0 +1,170 @@
+"""
+Tests for the workflow simulator.
+
+Run from the repository root with: python -m unittest tests.test_simulator
+"""
+
+import json
+import os
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+from ivcap_service import JobContext
+from ivcap_service.events import EventReporter, StepFinishEvent
+
+from simulator import WorkflowSimulator
+
+
+class RecordingReporter(EventReporter):
+    """EventReporter that records events, taking a little time per event."""
+
+    def __init__(self, delay_s: float = 0.0):
+        super().__init__("job:test", None)
+        self.delay_s = delay_s
+        self.events = []
+
+    def _send(self, event):
+        if self.delay_s:
+            time.sleep(self.delay_s)
+        self.events.append(event)
+
+
+class ConcurrentAgentsTest(unittest.TestCase):
+    AGENTS = 4
+    TASKS = 3
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        preset = {
+            "name": "concurrent",
+            "description": "Several agents in one phase",
+            "phases": [{
+                "id": "ph",
+                "name": "Phase",
+                "agents": [
+                    {
+                        "id": f"a{i}",
+                        "name": f"Agent {i}",
+                        "tasks": [f"task {j}" for j in range(self.TASKS)],
+                    }
+                    for i in range(self.AGENTS)
+                ],
+            }],
+        }
+        (Path(self._tmp.name) / "concurrent.json").write_text(json.dumps(preset))
+
+    def _run(self, reporter):
+        class Simulator(WorkflowSimulator):
+            PRESETS_DIR = Path(self._tmp.name)
+
+        simulator = Simulator(
+            job_context=JobContext(job_id="job:test", report=reporter),
+            concurrent_agents=True,
+        )
+        simulator._sample_delay_ms = lambda delay_bounds: 0
+        return simulator.run("concurrent")
+
+    def test_task_steps_precede_agent_finish(self):
+        for _ in range(5):
+            reporter = RecordingReporter(delay_s=0.005)
+            result = self._run(reporter)
+
+            self.assertEqual(result.agents_executed, self.AGENTS)
+            self.assertEqual(result.total_events, len(reporter.events))
+
+            finished_at = {
+                e.name: i for i, e in enumerate(reporter.events)
+                if isinstance(e, StepFinishEvent)
+            }
+            for i, event in enumerate(reporter.events):
+                if ":task-" in event.name:
+                    agent_step_id = event.name.rsplit(":", 1)[0]
+                    self.assertLess(i, finished_at[agent_step_id], event.name)
+
+
+class PresetCacheTest(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.presets_dir = Path(self._tmp.name)
+
+        class Simulator(WorkflowSimulator):
+            PRESETS_DIR = self.presets_dir
+
+        self.simulator = Simulator(
+            job_context=JobContext(job_id="job:test", report=RecordingReporter()),
+        )
+
+    def _write_preset(self, name, description):
+        path = self.presets_dir / f"{name}.json"
+        path.write_text(json.dumps(
+            {"name": name, "description": description, "phases": []}
+        ))
+        return path
+
+    @staticmethod
+    def _bump_mtime(path):
+        # Guarantee a new mtime even on filesystems with coarse timestamps.
+        mtime_ns = path.stat().st_mtime_ns + 1_000_000_000
+        os.utime(path, ns=(mtime_ns, mtime_ns))
+
+    def test_rewritten_preset_is_reloaded(self):
+        path = self._write_preset("edited", "first")
+        first = self.simulator.load_preset("edited")
+        self.assertIs(self.simulator.load_preset("edited"), first)
+
+        self._write_preset("edited", "second")
+        self._bump_mtime(path)
+        self.assertEqual(self.simulator.load_preset("edited").description, "second")
+
+    def test_added_preset_is_listed(self):
+        self._write_preset("first", "first")
+        self.assertEqual(self.simulator.list_presets(), ["first"])
+
+        self._write_preset("second", "second")
+        self._bump_mtime(self.presets_dir)
+        self.assertEqual(sorted(self.simulator.list_presets()), ["first", "second"])
+
+    def test_missing_presets_dir(self):
+        class Simulator(WorkflowSimulator):
+            PRESETS_DIR = self.presets_dir / "missing"
+
+        simulator = Simulator(
+            job_context=JobContext(job_id="job:test", report=RecordingReporter()),
+        )
+        self.assertEqual(simulator.list_presets(), [])
+        with self.assertRaisesRegex(FileNotFoundError, r"Available presets: \[\]"):
+            simulator.load_preset("anything")
+
+class TimerTickTest(unittest.TestCase):
+    def test_ticks_grouped_per_event_with_trailing_partial_group(self):
+        reporter = RecordingReporter()
+        simulator = WorkflowSimulator(
+            job_context=JobContext(job_id="job:test", report=reporter),
+        )
+        result = simulator.run_timer_tick(
+            total_run_time_seconds=0.55,
+            tick_interval_seconds=0.1,
+            ticks_per_event=4,
+        )
+
+        started = [e for e in reporter.events if not isinstance(e, StepFinishEvent)]
+        self.assertEqual([e.name for e in started], ["timer:ticks:1-4", "timer:ticks:5-6"])
+        self.assertEqual(
+            [e.options["message"] for e in started], ["Ticks 1..4", "Ticks 5..6"]
+        )
+        self.assertEqual(result.total_events, len(reporter.events))
+
+    def test_rejects_non_positive_ticks_per_event(self):
+        simulator = WorkflowSimulator(
+            job_context=JobContext(job_id="job:test", report=RecordingReporter()),
+        )
+        with self.assertRaises(ValueError):
+            simulator.run_timer_tick(0.1, 0.1, ticks_per_event=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -43,6 +43,10 @@ class Request(BaseModel):
         default=5.0,
         description="Tick interval for timer_tick preset (seconds)"
     )
+    ticks_per_event: Optional[int] = Field(
+        default=1,
+        description="Ticks aggregated into each emitted step for timer_tick preset (>= 1)"
+    )
     messages: Optional[list["ChatMessage"]] = Field(
         default=None,
         description="Conversation messages to send to the chat model",
@@ -242,6 +246,8 @@ def run_workflow_simulation(req: Request, jobCtxt: JobContext) -> Result:
             raise ValueError(
                 "total_run_time_seconds and tick_interval_seconds must be > 0"
             )
+        if req.ticks_per_event is not None and req.ticks_per_event < 1:
+            raise ValueError("ticks_per_event must be >= 1")
         total_run_time_seconds = req.total_run_time_seconds
         if total_run_time_seconds > WorkflowSimulator.MAX_TIMER_SECONDS:
             logger.warning(
@@ -254,6 +260,7 @@ def run_workflow_simulation(req: Request, jobCtxt: JobContext) -> Result:
         result = simulator.run_timer_tick(
             total_run_time_seconds=total_run_time_seconds,
             tick_interval_seconds=req.tick_interval_seconds,
+            ticks_per_event=req.ticks_per_event or 1,
         )
     else:
         result = simulator.run(req.preset_name)
@@ -315,4 +322,6 @@ def run_chat_simulation(req: ChatRequest, jobCtxt: JobContext) -> ChatResult:
 
 
 if __name__ == "__main__":
+    presets = WorkflowSimulator.warm_presets()
+    logger.info("Preloaded %d workflow presets: %s", len(presets), sorted(presets))
     start_tool_server(service)